@@ -10,7 +10,7 @@ STATUS_RUN = "run"
 STATUS_STOPPED = "stopped"
 STATUS_WAITING = "waiting"
 
-STATUS_SET = {
+STATUS_SET = frozenset({
     STATUS_ERROR,
     STATUS_INVALID,
     STATUS_LOADING,
@@ -18,4 +18,4 @@ STATUS_SET = {
     STATUS_RUN,
     STATUS_STOPPED,
     STATUS_WAITING,
-}
+})
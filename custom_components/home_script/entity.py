@@ -7,6 +7,8 @@ from . import const
 
 _LOGGER = getLogger(__name__)
 
+_MODULE_STATUSES = frozenset({const.STATUS_LOADING, const.STATUS_ERROR, const.STATUS_RUN, const.STATUS_STOPPED})
+
 
 class StatusEntity(Entity):
     """
@@ -24,6 +26,8 @@ class StatusEntity(Entity):
 
     def set_status(self, status: str):
         assert status in const.STATUS_SET, "Invalid status"
+        if status == self._status:
+            return
         self._status = status
         self.async_write_ha_state()
 
@@ -47,11 +51,17 @@ class ModuleEntity(Entity):
         self.entity_id = f"{const.DOMAIN}.script_{script_name}"
         self._attr_name = f"Script: {script_name}"
 
-    def set_status(self, status: str):
-        assert status in [const.STATUS_LOADING, const.STATUS_ERROR, const.STATUS_RUN, const.STATUS_STOPPED], \
-            "Invalid status"
+    def defer_status(self, status: str) -> bool:
+        """
+        Change status without writing state.
+
+        Return True if status is changed and state should be written later
+        """
+        assert status in _MODULE_STATUSES, "Invalid status"
+        if status == self._status:
+            return False
         self._status = status
-        self.async_write_ha_state()
+        return True
 
     @property
     def state(self) -> str:
@@ -2,8 +2,9 @@
 Home script module is interface to access to HASS from home scripts
 """
 
+import functools
 import typing
-from logging import getLogger
+from logging import DEBUG, getLogger
 
 import attrs
 from homeassistant import core
@@ -15,6 +16,7 @@ from homeassistant.components.input_select import InputSelect
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sun import Sun
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.helpers import entity_component
 from homeassistant.helpers.entity import Entity
 
 from .action import Action, action, sleep
@@ -84,19 +86,20 @@ class HomeScript:
     @staticmethod
     def load(hass: core.HomeAssistant) -> 'HomeScript':
         _LOGGER.debug("Load %s", HomeScript)
+        data_instances = hass.data[entity_component.DATA_INSTANCES]
         return HomeScript(
             hass=hass,
             state_event_manager=StateChangedManager.load(hass),
             script_manager=ScriptManager.load(hass),
             sun=hass.data['sun'],
-            binary_sensors=ComponentEntities.load(hass, "binary_sensor"),
-            counter=ComponentEntities.load(hass, "counter"),
-            input_booleans=ComponentEntities.load(hass, "input_boolean"),
-            input_numbers=ComponentEntities.load(hass, "input_number"),
-            input_selects=ComponentEntities.load(hass, "input_select"),
-            lights=ProxyComponentEntities.load(hass, "light", LightEntity),
-            sensors=ComponentEntities.load(hass, "sensor"),
-            switches=ComponentEntities.load(hass, "switch"),
+            binary_sensors=ComponentEntities.load(hass, "binary_sensor", data_instances),
+            counter=ComponentEntities.load(hass, "counter", data_instances),
+            input_booleans=ComponentEntities.load(hass, "input_boolean", data_instances),
+            input_numbers=ComponentEntities.load(hass, "input_number", data_instances),
+            input_selects=ComponentEntities.load(hass, "input_select", data_instances),
+            lights=ProxyComponentEntities.load(hass, "light", LightEntity, data_instances),
+            sensors=ComponentEntities.load(hass, "sensor", data_instances),
+            switches=ComponentEntities.load(hass, "switch", data_instances),
         )
 
     def unload(self):
@@ -109,15 +112,17 @@ class HomeScript:
         schema_script = self.script_manager[script_name]
         normal_schema = schema.normalize_schema(event_schema)
         _LOGGER.debug("Add %s schema items", len(normal_schema))
+        is_debug = _LOGGER.isEnabledFor(DEBUG)
         for event, action_list in normal_schema.items():
             if isinstance(event, StateEvent):
+                if is_debug:
+                    _LOGGER.debug("Add %s to state event manager", event)
                 self._add_state_event_actions(event, schema_script, action_list)
             else:
                 raise AssertionError(f"Unknown event {event} of type {type(event)}. Expect {StateEvent}")
         _LOGGER.debug("Schema was added")
 
     def _add_state_event_actions(self, event: StateEvent, schema_script: Script, action_list: list[Action]):
-        _LOGGER.debug("Add %s to state event manager", event)
         for item in action_list:
             self.state_event_manager.add(event, schema_script, item)
 
@@ -144,6 +149,11 @@ def unload():
 
 def get_logger(name: str):
     global logger_name
+    return _get_logger(name, logger_name)
+
+
+@functools.lru_cache(maxsize=512)
+def _get_logger(name: str, prefix: str):
     if name.startswith("home_script."):
         return getLogger(name)
-    return getLogger(logger_name + ".custom_module." + name)
+    return getLogger(prefix + ".custom_module." + name)
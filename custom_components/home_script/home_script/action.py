@@ -1,5 +1,5 @@
 import asyncio
-import inspect
+import functools
 import types
 import typing
 from logging import getLogger
@@ -27,30 +27,28 @@ def _value(src: T) -> T: ...
 
 
 def _value(src):
-    return src() if isinstance(src, ConditionValue) else src
+    # ConditionValue is never subclassed, so exact type check is enough (and cheaper than isinstance)
+    return src() if type(src) is ConditionValue else src
 
 
-def _is_async(func) -> bool:
-    if inspect.iscoroutinefunction(func):
-        return True
-    real_func = getattr(func, "__func__", None)
-    if real_func is not None and inspect.iscoroutinefunction(real_func):
-        return True
-    return False
-
-
-@attrs.frozen
+@attrs.frozen(slots=True, cache_hash=True)
 class Function:
     function: typing.Callable | types.MethodType | typing.Coroutine = attrs.field()
     instance: object | None = attrs.field()
     is_async: bool = attrs.field()
     arguments: tuple[str, ...] = attrs.field(hash=False, eq=False)
+    # names of arguments that must be provided as keywords, indexed by number of positional arguments
+    remain_arguments: tuple[frozenset[str], ...] = attrs.field(
+        init=False, hash=False, eq=False, repr=False,
+        default=attrs.Factory(lambda self: tuple(frozenset(self.arguments[i:]) for i in range(len(self.arguments) + 1)),
+                              takes_self=True),
+    )
 
     @staticmethod
     def create(func: typing.Callable | types.MethodType | typing.Coroutine, instance: object | None) -> "Function":
         is_method, params = utils.function_or_method_and_params(func)
         assert not is_method or instance is not None, f"Instance must be provided for unbound function {func}"
-        return Function(func, instance, _is_async(func), params)
+        return Function(func, instance, utils.is_async(func), params)
 
     def __str__(self):
         of_str = ""
@@ -66,20 +64,24 @@ class Function:
         return self.function(*args, **kwargs)
 
     def args(self, act: "Action") -> tuple[tuple, dict]:
-        if len(act.args) > len(self.arguments):
+        act_args = act.args
+        if len(act_args) > len(self.arguments):
             raise ArgumentsNotCompatible(f"{self} required more arguments than {act} has")
-        args = tuple(_value(i) for i in act.args[:len(self.arguments)])
-        remain_args = set(self.arguments[len(args):])
-        unprovided_args = remain_args.difference(act.kwargs)
+        value = _value
+        args = tuple(value(i) for i in act_args)
+        remain_args = self.remain_arguments[len(act_args)]
+        act_kwargs = act.kwargs
+        unprovided_args = remain_args.difference(act_kwargs)
         if unprovided_args:
             raise ArgumentsNotCompatible(f"{act} does not has {unprovided_args} arguments that required by {self}")
-        kwargs = {i: _value(v) for i, v in act.kwargs.items() if i in remain_args}
+        # all remain arguments are provided, so extra kwargs of action are skipped without membership test
+        kwargs = {i: value(act_kwargs[i]) for i in remain_args}
         if self.instance:
             args = (self.instance,) + args
         return args, kwargs
 
 
-@attrs.frozen(slots=True)
+@attrs.frozen(slots=True, cache_hash=True)
 class Action(typing.Generic[T]):
     """
     Represent action that can be called from script.
@@ -92,6 +94,10 @@ class Action(typing.Generic[T]):
     functions: tuple[Function, ...]
     args: tuple = attrs.field(factory=tuple)
     kwargs: dict = attrs.field(factory=dict, hash=False)
+    is_async: bool = attrs.field(
+        init=False, hash=False, eq=False, repr=False,
+        default=attrs.Factory(lambda self: any(i.is_async for i in self.functions), takes_self=True),
+    )
 
     def __str__(self):
         async_str = "async " if self.is_async else ""
@@ -112,11 +118,7 @@ class Action(typing.Generic[T]):
         """
         if not args and not kwargs:
             return self
-        return attrs.evolve(self, args=self.args + args, kwargs=self.kwargs | kwargs)
-
-    @property
-    def is_async(self) -> bool:
-        return any(i.is_async for i in self.functions)
+        return Action(self.functions, self.args + args, self.kwargs | kwargs)
 
     def check(self):
         for func in self.functions:
@@ -125,22 +127,24 @@ class Action(typing.Generic[T]):
     def run(self):
         assert not self.is_async, "Can not run async action"
         for func in self.functions:
-            func.run(self)
+            args, kwargs = func.args(self)
+            func.function(*args, **kwargs)
 
     async def async_run(self):
         for func in self.functions:
+            args, kwargs = func.args(self)
             if func.is_async:
-                await func.run(self)
+                await func.function(*args, **kwargs)
             else:
-                func.run(self)
+                func.function(*args, **kwargs)
 
     def __floordiv__(self, other: "Action") -> "Action":
         if other.args:
             raise ValueError("Left action in sequence can not have assigned args")
-        common_kwargs = set(self.kwargs) & set(other.kwargs)
-        if common_kwargs:
+        if not self.kwargs.keys().isdisjoint(other.kwargs):
+            common_kwargs = self.kwargs.keys() & other.kwargs.keys()
             raise ValueError(f"Actions in sequence has common kwargs: {', '.join(sorted(common_kwargs))}")
-        return attrs.evolve(self, functions=self.functions + other.functions)
+        return Action(self.functions + other.functions, self.args, self.kwargs | other.kwargs)
 
 
 @attrs.frozen(slots=True)
@@ -156,12 +160,12 @@ class ActionDescriptor(typing.Generic[T]):
         raise ValueError(f"{self} can not be set")
 
     def __str__(self):
-        async_str = "async " if _is_async(self.function) else ""
+        async_str = "async " if utils.is_async(self.function) else ""
         return f"{async_str}action {self.function.__qualname__} of unbound instance"
 
     @property
     def is_async(self) -> bool:
-        return _is_async(self.function)
+        return utils.is_async(self.function)
 
 
 def action(func: typing.Callable | Action, *args, **kwargs) -> Action:
@@ -186,6 +190,14 @@ def sleep(seconds: float) -> Action:
     """
     Create an action that will wait.
     """
+    return _sleep_action(seconds)
+
+
+@functools.lru_cache(maxsize=256)
+def _sleep_action(seconds: float) -> Action:
+    """
+    Actions are immutable, so the same sleep action can be shared between scripts
+    """
 
     async def _sleep():
         await asyncio.sleep(seconds)
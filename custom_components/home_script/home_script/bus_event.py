@@ -3,7 +3,7 @@ from logging import getLogger
 
 import attrs
 
-from .condition import Condition, condition_decorator_factory
+from .condition import Condition, condition_decorator_factory, intern_arguments
 
 __all__ = (
     "BusEvent",
@@ -15,10 +15,10 @@ T = typing.TypeVar("T")
 
 _LOGGER = getLogger(__name__)
 
-EVENT_FILTER_ARGS = {'event', }
+EVENT_FILTER_ARGS = intern_arguments({'event', })
 
 
-@attrs.frozen(slots=True)
+@attrs.frozen(slots=True, cache_hash=True)
 class BusEvent:
     """
     HASS event that defined only by type.
@@ -43,7 +43,7 @@ class BusEvent:
 
     def __rshift__(self, other: Condition) -> "BusEvent":
         new_filter = other if self.condition is None else (self.condition & other)
-        return attrs.evolve(self, condition=new_filter)
+        return BusEvent(self.event_type, new_filter)
 
 
 def bus_event_condition(func) -> Condition:
@@ -18,45 +18,66 @@ class ComponentEntities(typing.Generic[EntityT]):
     hass: core.HomeAssistant
     domain: str
     component: entity_component.EntityComponent[EntityT] | None
+    _get_entity: typing.Callable[[str], EntityT | None] | None = attrs.field(
+        init=False, repr=False,
+        default=attrs.Factory(lambda self: self.component.get_entity if self.component else None, takes_self=True),
+    )
 
     @staticmethod
-    def load(hass: core.HomeAssistant, domain: str):
-        data_instances = hass.data[entity_component.DATA_INSTANCES]
-        try:
-            _LOGGER.debug("Load component entities for domain %s", domain)
-            component = typing.cast(entity_component.EntityComponent[EntityT], data_instances[domain])
-        except KeyError:
+    def load(hass: core.HomeAssistant, domain: str, data_instances: dict | None = None):
+        """
+        Data instances of HASS can be provided to avoid lookup for each domain
+        """
+        if data_instances is None:
+            data_instances = hass.data[entity_component.DATA_INSTANCES]
+        _LOGGER.debug("Load component entities for domain %s", domain)
+        component = typing.cast(entity_component.EntityComponent[EntityT] | None, data_instances.get(domain))
+        if component is None:
             _LOGGER.info("Can not find domain %s", domain)
-            component = None
         return ComponentEntities(hass, domain, component)
 
     def __getitem__(self, item: str) -> EntityT:
-        if self.component is None:
+        get_entity = self._get_entity
+        if get_entity is None:
             data_instances = self.hass.data[entity_component.DATA_INSTANCES]
             raise ValueError(f"Can not find EntityComponent for domain {self.domain}. "
                              f"Known domains are: {','.join(sorted(data_instances.keys()))}")
-        result = self.component.get_entity(item)
+        result = get_entity(item)
         if result is None:
             raise KeyError(f"Entity '{item}' not found")
         return result
 
 
+class _ProxyCache(dict):
+    """
+    Proxy entities by entity_id. Missing proxy is created on first access.
+    """
+
+    def __init__(self, component_entity: ComponentEntities, proxy_cls: type):
+        super().__init__()
+        self.component_entity = component_entity
+        self.proxy_cls = proxy_cls
+
+    def __missing__(self, key: str):
+        result = self[key] = self.proxy_cls(self.component_entity[key])
+        return result
+
+
 @attrs.define
 class ProxyComponentEntities(typing.Generic[EntityT]):
     component_entity: ComponentEntities
     proxy_cls: type
-    cache: dict[str, EntityT] = attrs.field(factory=dict)
+    cache: dict[str, EntityT] = attrs.field(
+        init=False,
+        default=attrs.Factory(lambda self: _ProxyCache(self.component_entity, self.proxy_cls), takes_self=True),
+    )
 
     @staticmethod
-    def load(hass: core.HomeAssistant, domain: str, proxy_cls: type):
+    def load(hass: core.HomeAssistant, domain: str, proxy_cls: type, data_instances: dict | None = None):
         return ProxyComponentEntities(
-            component_entity=ComponentEntities.load(hass, domain),
+            component_entity=ComponentEntities.load(hass, domain, data_instances),
             proxy_cls=proxy_cls
         )
 
     def __getitem__(self, item: str) -> EntityT:
-        if (proxy_entity := self.cache.get(item)) is None:
-            main_entity = self.component_entity[item]
-            proxy_entity = self.proxy_cls(main_entity)
-            self.cache[item] = proxy_entity
-        return proxy_entity
+        return self.cache[item]
@@ -19,12 +19,16 @@ T = typing.TypeVar("T")
 
 _LOGGER = getLogger(__name__)
 
+# the same argument sets are shared by conditions, so they can be compared by identity first
+_INTERNED_ARGUMENTS: dict[frozenset[str], frozenset[str]] = {}
+
 
 @attrs.frozen(slots=True)
 class Condition:
     """
     Condition can be True or False.
     Condition can have keyword arguments. All arguments must be provided to get condition value.
+    Condition must not have side effects: result of condition without arguments can be reused during one event.
 
     @ivar arguments: list of arguments that must be provided for this condition (None means all argument ignored)
     @ivar is_inverted: invert result
@@ -33,11 +37,30 @@ class Condition:
     is_inverted: bool
 
     def __call__(self, **kwargs) -> bool:
-        assert self.arguments is None or set(kwargs) == self.arguments, \
+        assert self.arguments is None or kwargs.keys() == self.arguments, \
             f"Expect condition arguments {', '.join(sorted(self.arguments))}, got {', '.join(sorted(kwargs))}"
+        return self.cached_call({}, **kwargs)
+
+    def cached_call(self, cache: dict[int, bool], **kwargs) -> bool:
+        """
+        Same as call, but result of condition without arguments is taken from cache if it is there
+
+        Cache is short-lived (e.g. one event dispatch), so conditions are keyed by identity.
+        """
+        if self.arguments is None:
+            key = id(self)
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+            result = cache[key] = self._evaluate(cache, kwargs)
+            return result
+        return self._evaluate(cache, kwargs)
+
+    def _evaluate(self, cache: dict[int, bool], kwargs: dict) -> bool:
         if self.is_inverted:
-            return not self._run(**kwargs)
-        return self._run(**kwargs)
+            return not self._run_cached(cache, **kwargs)
+        return self._run_cached(cache, **kwargs)
 
     def __invert__(self: T) -> T:
         return attrs.evolve(self, is_inverted=not self.is_inverted)
@@ -49,21 +72,22 @@ class Condition:
         return ConditionValue[T](self, item[0], item[1])
 
     def __and__(self, other: "Condition") -> "Condition":
-        arguments = other.arguments if self.arguments is None else self.arguments
-        return ConditionAnd(arguments, False, (self, other))
+        return _join_conditions(ConditionAnd, self, other)
 
     def __or__(self, other: "Condition") -> "Condition":
-        arguments = other.arguments if self.arguments is None else self.arguments
-        return ConditionOr(arguments, False, (self, other))
+        return _join_conditions(ConditionOr, self, other)
 
     def _run(self, **kwargs) -> bool:
         raise NotImplemented
 
-    def is_compatible_with_arguments(self, arguments: set[str] | None) -> bool:
-        return self.arguments is None or arguments == self.arguments
+    def _run_cached(self, _cache: dict[int, bool], **kwargs) -> bool:
+        return self._run(**kwargs)
+
+    def is_compatible_with_arguments(self, arguments: typing.AbstractSet[str] | None) -> bool:
+        return self.arguments is None or arguments is self.arguments or arguments == self.arguments
 
     def is_compatible(self, other: "Condition"):
-        return other.arguments is None or other.arguments == self.arguments
+        return other.arguments is None or other.arguments is self.arguments or other.arguments == self.arguments
 
     def short_str(self):
         return "--"
@@ -87,23 +111,14 @@ class ConditionAnd(Condition):
     def short_str(self):
         return f"{'NOT ' if self.is_inverted else ''}({' AND '.join(i.short_str() for i in self.conditions)})"
 
-    def _run(self, **kwargs) -> bool:
-        assert self.conditions
+    def _run_cached(self, cache: dict[int, bool], **kwargs) -> bool:
         for item in self.conditions:
-            if not item(**kwargs):
+            if not item.cached_call(cache, **kwargs):
                 _LOGGER.debug("Failed %s in statement %s", item, self)
                 return False
         # _LOGGER.debug("All of %s is success", self)
         return True
 
-    def __and__(self, other):
-        if self.is_inverted:
-            return super().__and__(other)
-        conditions = self.conditions + (other, )
-        if self.arguments is None:
-            return attrs.evolve(self, arguments=other.arguments, conditions=conditions)
-        return attrs.evolve(self, conditions=conditions)
-
 
 @attrs.frozen(slots=True)
 class ConditionOr(Condition):
@@ -115,22 +130,33 @@ class ConditionOr(Condition):
     def short_str(self):
         return f"{'NOT ' if self.is_inverted else ''}({' OR '.join(i.short_str() for i in self.conditions)})"
 
-    def _run(self, **kwargs) -> bool:
-        assert self.conditions
+    def _run_cached(self, cache: dict[int, bool], **kwargs) -> bool:
         for item in self.conditions:
-            if item(**kwargs):
+            if item.cached_call(cache, **kwargs):
                 # _LOGGER.debug("Success %s in %s", item, self)
                 return True
         _LOGGER.debug("All conditions in statement %s is failed", self)
         return False
 
-    def __or__(self, other):
-        if self.is_inverted:
-            return super().__or__(other)
-        conditions = self.conditions + (other, )
-        if self.arguments is None:
-            return attrs.evolve(self, arguments=other.arguments, conditions=conditions)
-        return attrs.evolve(self, conditions=conditions)
+
+def _flat_conditions(cls: type, item: Condition) -> tuple[Condition, ...]:
+    if type(item) is cls and not item.is_inverted:
+        return item.conditions
+    return item,
+
+
+def _join_conditions(cls: type[ConditionAnd] | type[ConditionOr], left: Condition, right: Condition) -> Condition:
+    """
+    Join conditions into one flat statement.
+
+    Not inverted statements of the same type are merged, repeated conditions are removed.
+    Order of conditions is kept as written: earlier conditions can guard later ones.
+    """
+    arguments = right.arguments if left.arguments is None else left.arguments
+    conditions = tuple(dict.fromkeys(_flat_conditions(cls, left) + _flat_conditions(cls, right)))
+    if len(conditions) == 1:
+        return conditions[0]
+    return cls(arguments, False, conditions)
 
 
 @attrs.frozen(slots=True)
@@ -140,30 +166,31 @@ class FuncCondition(Condition):
     """
     function: typing.Callable[[...], bool] | typing.Callable[[object, ...], bool] = attrs.field()
     instance: object | None = attrs.field(default=None, hash=False)
+    # object shown after `of` in string representation (formatted on request, its state can change)
+    _owner: object | None = attrs.field(
+        init=False, default=attrs.Factory(lambda self: self._find_owner(), takes_self=True),
+        eq=False, hash=False, repr=False,
+    )
 
-    def __str__(self):
-        invert_str = 'not ' if self.is_inverted else ''
-        # args_str = ', '.join(sorted(self.arguments)) if self.arguments is not None else '*'
-        result = f"condition {invert_str}{self.function.__qualname__}"
+    def _find_owner(self) -> object | None:
         if self.instance is not None:
-            of_str = f" of {self.instance}"
-        elif isinstance(self.function, types.MethodType):
-            of_str = f" of {self.function.__self__}"
-        else:
-            of_str = ""
-        return result + of_str
+            return self.instance
+        if isinstance(self.function, types.MethodType):
+            return self.function.__self__
+        return None
+
+    def __str__(self):
+        return "condition " + self._str(invert_str='not ')
 
     def short_str(self):
-        invert_str = 'NOT ' if self.is_inverted else ''
+        return self._str(invert_str='NOT ')
+
+    def _str(self, invert_str: str) -> str:
         # args_str = ', '.join(sorted(self.arguments)) if self.arguments is not None else '*'
-        result = f"{invert_str}{self.function.__qualname__}"
-        if self.instance is not None:
-            of_str = f" of {self.instance}"
-        elif isinstance(self.function, types.MethodType):
-            of_str = f" of {self.function.__self__}"
-        else:
-            of_str = ""
-        return result + of_str
+        result = f"{invert_str if self.is_inverted else ''}{self.function.__qualname__}"
+        if self._owner is not None:
+            return f"{result} of {self._owner}"
+        return result
 
     def _run(self, **kwargs) -> bool:
         if self.arguments is None:
@@ -195,7 +222,7 @@ class ConditionValue(typing.Generic[T]):
 
 @attrs.frozen(slots=True)
 class ConditionDescriptor:
-    arguments: set[str] | None
+    arguments: frozenset[str] | None
     function: typing.Callable[[object, ...], bool]
 
     def __get__(self, instance: T | None, owner: type[T] = None):
@@ -210,8 +237,16 @@ class ConditionDescriptor:
         return f"condition {self.function.__qualname__} of unbound instance"
 
 
-def condition_decorator_factory(arguments: set[str] | None) -> typing.Callable[[typing.Callable], Condition]:
-    arguments = frozenset(arguments) if arguments is not None else None
+def intern_arguments(arguments: typing.Iterable[str]) -> frozenset[str]:
+    # frozenset of frozenset returns the same object, so interned sets are not copied
+    arguments = frozenset(arguments)
+    return _INTERNED_ARGUMENTS.setdefault(arguments, arguments)
+
+
+def condition_decorator_factory(
+        arguments: typing.AbstractSet[str] | None,
+) -> typing.Callable[[typing.Callable], Condition]:
+    arguments = intern_arguments(arguments) if arguments is not None else None
 
     def _condition(func: typing.Callable[[], bool] | typing.Callable[[object], bool]):
         if not callable(func):
@@ -51,13 +51,41 @@ TURN_OFF_PARAMS = {
     light.ATTR_FLASH, light.ATTR_TRANSITION
 }
 
+# templates of params for filter functions (they pop unsupported keys, so copy must be passed)
+_MAIN_TURN_ON_NONES = dict.fromkeys(MAIN_TURN_ON_PARAMS)
+_TURN_OFF_NONES = dict.fromkeys(TURN_OFF_PARAMS)
+
 TURN_ON_SCHEMA = vol.Schema(light.LIGHT_TURN_ON_SCHEMA)
 TURN_OFF_SCHEMA = vol.Schema(light.LIGHT_TURN_OFF_SCHEMA)
 
+# supported params depend only on entity class and its capabilities
+_TURN_ON_PARAMS_CACHE: dict[tuple, frozenset[str]] = {}
+_TURN_OFF_PARAMS_CACHE: dict[tuple, frozenset[str]] = {}
+
+
+def _light_params_key(entity: LightEntity) -> tuple:
+    return type(entity), frozenset(entity.supported_color_modes or ()), entity.supported_features
+
+
+def _light_turn_on_params(entity: LightEntity) -> frozenset[str]:
+    key = _light_params_key(entity)
+    result = _TURN_ON_PARAMS_CACHE.get(key)
+    if result is None:
+        result = _TURN_ON_PARAMS_CACHE[key] = _compute_light_turn_on_params(entity)
+    return result
+
+
+def _light_turn_off_params(entity: LightEntity) -> frozenset[str]:
+    key = _light_params_key(entity)
+    result = _TURN_OFF_PARAMS_CACHE.get(key)
+    if result is None:
+        result = _TURN_OFF_PARAMS_CACHE[key] = _compute_light_turn_off_params(entity)
+    return result
+
 
-def _light_turn_on_params(entity: LightEntity) -> set[str]:
+def _compute_light_turn_on_params(entity: LightEntity) -> frozenset[str]:
     _LOGGER.debug("Get turn on params for %s", entity)
-    turn_on_params = set(light.filter_turn_on_params(entity, {i: None for i in MAIN_TURN_ON_PARAMS}))
+    turn_on_params = set(light.filter_turn_on_params(entity, _MAIN_TURN_ON_NONES.copy()))
     _LOGGER.debug("Main params: %s", turn_on_params)
     if turn_on_params.intersection(BRIGHTNESS_ATTRS):
         _LOGGER.debug("Add all brightness params")
@@ -67,29 +95,35 @@ def _light_turn_on_params(entity: LightEntity) -> set[str]:
         turn_on_params.difference_update(COLOR_TEMP_ATTRS)
         turn_on_params.add(light.ATTR_COLOR_TEMP_KELVIN)
 
-    result = {light.ATTR_PROFILE, } | turn_on_params
+    result = frozenset({light.ATTR_PROFILE, } | turn_on_params)
     _LOGGER.debug("Result: %s", result)
     return result
 
 
-def _light_turn_off_params(entity: LightEntity) -> set[str]:
+def _compute_light_turn_off_params(entity: LightEntity) -> frozenset[str]:
     _LOGGER.debug("Get turn off params for %s", entity)
-    result = set(light.filter_turn_off_params(entity, {i: None for i in TURN_OFF_PARAMS}))
+    result = frozenset(light.filter_turn_off_params(entity, _TURN_OFF_NONES.copy()))
     _LOGGER.debug("Result: %s", result)
     return result
 
 
 class ParamAction(Action):
+    # arguments of proxy __call__ (signature is inspected once per class)
+    _proxy_call_args: typing.ClassVar[frozenset[str]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _, proxy_call_args = utils.function_or_method_and_params(cls.__call__, skip_kwargs=False)
+        cls._proxy_call_args = frozenset(proxy_call_args)
 
     @classmethod
-    def create(cls: type[T], bound_method, arguments: set[str]) -> T:
+    def create(cls: type[T], bound_method, arguments: typing.AbstractSet[str]) -> T:
         is_method, args = utils.function_or_method_and_params(bound_method, skip_kwargs=False)
         assert args == ("kwargs",), f"Unexpected method with args {args}"
         assert not is_method, "Expect only bound method"
         instance = getattr(bound_method, "__self__")
         assert instance is not None, "Expect only bound instance"
-        _, proxy_call_args = utils.function_or_method_and_params(cls.__call__, skip_kwargs=False)
-        unsupported_args = arguments.difference(proxy_call_args)
+        unsupported_args = arguments - cls._proxy_call_args
         assert not unsupported_args, f"Requested arguments does not supported by proxy: {', '.join(unsupported_args)}"
         func = Function(bound_method, None, is_async=utils.is_async(bound_method), arguments=tuple(arguments))
         return typing.cast(TurnOnAction, Action((func,), kwargs={i: None for i in arguments}))
@@ -128,7 +162,8 @@ class ProxyLightEntity(Entity):
     is_off: Condition
 
     _entity: LightEntity
-    _turn_on_arguments: set[str]
+    _turn_on_arguments: frozenset[str]
+    _turn_off_arguments: frozenset[str]
 
     def __init__(self, entity: LightEntity):
         assert isinstance(entity, LightEntity), f"Unexpected entity for light proxy {entity}"
@@ -144,7 +179,8 @@ class ProxyLightEntity(Entity):
         return f"@{self._entity}"
 
     async def _async_turn_on(self, **kwargs):
-        _, kwargs = self._validate_turn_on_arguments((), kwargs)
+        # keys are already restricted to supported arguments by action and service call validates values
+        kwargs = self._check_trusted_turn_on_arguments(kwargs)
         _LOGGER.debug("Turn on %s with args %s", self._entity, kwargs)
         return await self._entity.hass.services.async_call(
             "light",
@@ -164,6 +200,18 @@ class ProxyLightEntity(Entity):
         unsupported_args = set(kwargs).difference(self._turn_on_arguments)
         if unsupported_args:
             raise ValueError(f"Unsupported arguments: {', '.join(sorted(unsupported_args))}")
+        self._check_turn_on_values(kwargs)
+        return args, kwargs
+
+    def _check_trusted_turn_on_arguments(self, kwargs: dict) -> dict:
+        """
+        Check arguments passed by turn on action without schema validation
+        """
+        kwargs = {i: v for i, v in kwargs.items() if v is not None}
+        self._check_turn_on_values(kwargs)
+        return kwargs
+
+    def _check_turn_on_values(self, kwargs: dict):
         effect = kwargs.get(light.ATTR_EFFECT)
         if effect is not None and effect not in self._entity.effect_list:
             raise ValueError(f"Unsupported effect `{effect}`")
@@ -173,7 +221,6 @@ class ProxyLightEntity(Entity):
         color_name = kwargs.get(light.ATTR_COLOR_NAME)
         if color_name is not None:
             color_util.color_name_to_rgb(color_name)
-        return args, kwargs
 
     async def _async_turn_off(self, **kwargs):
         _, kwargs = self._validate_turn_off_arguments((), kwargs)
@@ -1,9 +1,13 @@
+import operator
+import typing
 from logging import getLogger
 
 from .action import Action
 from .condition import Condition
 from .state_event import StateEvent
 
+T = typing.TypeVar("T")
+
 _LOGGER = getLogger(__name__)
 
 EVENT_SOURCE = StateEvent
@@ -11,32 +15,8 @@ ACTION = Action | list[Action]
 CONDITION = Condition
 
 
-# I believe that deep is enough!!!!
-ACTION_SCHEMA = dict[
-    CONDITION,
-    ACTION | dict[
-        CONDITION,
-        ACTION | dict[
-            CONDITION,
-            ACTION | dict[
-                CONDITION,
-                ACTION | dict[
-                    CONDITION,
-                    ACTION | dict[
-                        CONDITION,
-                        ACTION | dict[
-                            CONDITION,
-                            ACTION | dict[
-                                CONDITION,
-                                ACTION
-                            ]
-                        ]
-                    ]
-                ]
-            ]
-        ]
-    ]
-] | ACTION
+# recursive alias is resolved lazily (only by type checkers or typing.get_type_hints)
+ACTION_SCHEMA: typing.TypeAlias = "ACTION | dict[CONDITION, ACTION_SCHEMA]"
 
 
 EVENT_SCHEMA = dict[
@@ -47,40 +27,51 @@ EVENT_SCHEMA = dict[
 NORMAL_SCHEMA = dict[EVENT_SOURCE, list[Action]]
 
 
+def _iter_action_schema(
+        condition_schema: ACTION_SCHEMA, start: T, apply: typing.Callable[[T, CONDITION], T],
+) -> typing.Iterator[tuple[T, list[Action]]]:
+    """
+    Walk over schema in depth-first order and yield not empty lists of actions.
+
+    Conditions are applied to the start value once per dict key, so leaves of the same branch share result.
+    """
+    stack: list[tuple[T, ACTION_SCHEMA]] = [(start, condition_schema)]
+    while stack:
+        applied, value = stack.pop()
+        if isinstance(value, dict):
+            items = []
+            for key, sub_schema in value.items():
+                assert isinstance(key, Condition), f"Invalid condition {key}"
+                items.append((apply(applied, key), sub_schema))
+            # keep order of keys: last pushed item is processed first
+            stack.extend(reversed(items))
+        elif isinstance(value, list):
+            assert all(isinstance(i, Action) for i in value), f"Invalid action in list {value}"
+            if value:
+                yield applied, value
+        else:
+            assert isinstance(value, Action), f"Invalid action {value}"
+            yield applied, [value]
+
+
+def _add_condition(conditions: tuple[CONDITION, ...], condition: CONDITION) -> tuple[CONDITION, ...]:
+    return conditions + (condition,)
+
+
 def normalize_action_schema(condition_schema: ACTION_SCHEMA) -> dict[tuple[CONDITION, ...], list[Action]]:
-    _LOGGER.debug("Compile condition schema of size")
-    if not isinstance(condition_schema, dict):
-        if isinstance(condition_schema, list):
-            _LOGGER.debug("Got list of actions")
-            assert all(isinstance(i, Action) for i in condition_schema), f"Invalid action in list {condition_schema}"
-            return {(): condition_schema} if condition_schema else {}
-        _LOGGER.debug("Got action")
-        assert isinstance(condition_schema, Action), f"Invalid action {condition_schema}"
-        return {(): [condition_schema]}
-    _LOGGER.debug("Compile dict schema")
+    _LOGGER.debug("Compile condition schema")
     result = {}
-    for key, value in condition_schema.items():
-        assert isinstance(key, Condition), f"Invalid condition {key}"
-        sub_schema = normalize_action_schema(value)
-        for sub_conditions, actions in sub_schema.items():
-            result.setdefault((key,) + sub_conditions, []).extend(actions)
+    for conditions, actions in _iter_action_schema(condition_schema, (), _add_condition):
+        result.setdefault(conditions, []).extend(actions)
     return result
 
 
-def _apply_conditions(event: EVENT_SOURCE, conditions: tuple[CONDITION, ...]) -> EVENT_SOURCE:
-    _LOGGER.debug("Apply %s to %s", conditions, event)
-    for item in conditions:
-        event = (event >> item)
-    return event
-
-
 def normalize_schema(event_schema: EVENT_SCHEMA) -> NORMAL_SCHEMA:
     _LOGGER.debug("Normalize event schema")
     result: NORMAL_SCHEMA = {}
     for event_source, action in event_schema.items():
-        sub_schema = normalize_action_schema(action)
-        for conditions, actions in sub_schema.items():
+        for event, actions in _iter_action_schema(action, event_source, operator.rshift):
             for item in actions:
                 item.check()
-            result.setdefault(_apply_conditions(event_source, conditions), []).extend(actions)
+            result.setdefault(event, []).extend(actions)
     return result
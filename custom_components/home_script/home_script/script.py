@@ -1,6 +1,6 @@
 import asyncio
 import typing
-from logging import getLogger
+from logging import DEBUG, getLogger
 
 import attrs
 from homeassistant import core
@@ -12,7 +12,7 @@ _LOGGER = getLogger(__name__)
 T = typing.TypeVar('T')
 
 
-@attrs.define(hash=True)
+@attrs.define(eq=False)
 class Script:
     """
     Script is list of task.
@@ -23,8 +23,11 @@ class Script:
     """
     hass: core.HomeAssistant
     name: str
-    tasks: set[asyncio.Task] = attrs.field(factory=set, hash=False)
-    is_stopped: bool = attrs.field(default=False, hash=False)
+    tasks: set[asyncio.Task] = attrs.field(factory=set)
+    is_stopped: bool = False
+    _discard_task: typing.Callable[[asyncio.Task], None] = attrs.field(
+        init=False, default=attrs.Factory(lambda self: self.tasks.discard, takes_self=True), repr=False,
+    )
 
     def __str__(self):
         args = []
@@ -48,16 +51,28 @@ class Script:
         self.cancel_all_tasks()
 
     def cancel_all_tasks(self):
-        _LOGGER.debug("Cancel all task of %s", self)
+        is_debug = _LOGGER.isEnabledFor(DEBUG)
+        if is_debug:
+            _LOGGER.debug("Cancel all task of %s", self)
         for task in self.tasks:
-            _LOGGER.debug("Cancel %s", task)
+            if is_debug:
+                _LOGGER.debug("Cancel %s", task)
             task.cancel()
 
     def _add_task(self, task: asyncio.Task):
         _LOGGER.debug("Add task %s to %s", task, self)
         assert task not in self.tasks, "Duplication of task is impossible"
         self.tasks.add(task)
-        task.add_done_callback(self.tasks.discard)
+        task.add_done_callback(self._discard_task)
+
+    def replace_actions(self, actions: typing.Iterable[Action]):
+        """
+        Cancel current tasks and run new actions
+        """
+        self.cancel_all_tasks()
+        for action in actions:
+            # sync action can stop script, so check is kept for each action
+            self.run_action(action)
 
     def run_action(self, action: Action):
         if self.is_stopped:
@@ -95,7 +110,7 @@ class Script:
             _LOGGER.exception("Error in %s", action)
 
 
-@attrs.define
+@attrs.define(eq=False)
 class ScriptManager:
     hass: core.HomeAssistant
     scripts: dict[str, Script] = attrs.field(factory=dict)
@@ -5,7 +5,7 @@ import attrs
 from homeassistant import core
 from homeassistant.helpers.entity import Entity
 
-from .condition import Condition, condition_decorator_factory
+from .condition import Condition, condition_decorator_factory, intern_arguments
 
 __all__ = (
     "StateEvent",
@@ -17,7 +17,7 @@ T = typing.TypeVar("T")
 
 _LOGGER = getLogger(__name__)
 
-STATE_EVENT_FILTER_ARGS = {'entity_id', 'old', 'new', }
+STATE_EVENT_FILTER_ARGS = intern_arguments({'entity_id', 'old', 'new', })
 
 
 @attrs.frozen(slots=True)
@@ -41,8 +41,7 @@ class StateEvent:
         return result
 
     def __rshift__(self, other: Condition) -> "StateEvent":
-        new_condition = other if self.condition is None else (self.condition & other)
-        return attrs.evolve(self, condition=new_condition)
+        return StateEvent(self.entity_id, other if self.condition is None else (self.condition & other))
 
     def old(self, acceptable_state: str, *args: str) -> "StateEvent":
         return self >> old_state_condition(acceptable_state, *args)
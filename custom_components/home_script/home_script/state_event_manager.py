@@ -1,8 +1,9 @@
 import typing
-from logging import getLogger
+from logging import DEBUG, INFO, getLogger
 
 import attrs
-from homeassistant import const, core
+from homeassistant import core
+from homeassistant.helpers.event import async_track_state_change_event
 
 from .action import Action
 from .script import Script
@@ -11,68 +12,97 @@ from .state_event import StateEvent
 _LOGGER = getLogger(__name__)
 _LOGGER_TRACE = getLogger(__name__ + ".trace")
 
+# bound test of state event condition (None if there is no condition), state event, script and action
+_DispatchItem = tuple[typing.Callable[..., bool] | None, StateEvent, Script, Action]
 
-@attrs.define
+
+@attrs.define(eq=False)
 class StateChangedManager:
     """
     Wrapper to work with change state events.
 
-    I catch all state change events and look for processing of event by entity id
+    I track state changes only of entities with triggers and look for processing of event by entity id
     """
     hass: core.HomeAssistant
     entity_state_triggers: dict[str, list[tuple[StateEvent, Script, Action]]] = attrs.Factory(dict)
-    cancel_callback: core.CALLBACK_TYPE | None = None
+    entity_cancel_callbacks: dict[str, core.CALLBACK_TYPE] = attrs.Factory(dict)
+    # triggers of entity prepared for dispatching, rebuilt after new trigger is added
+    _entity_dispatch: dict[str, tuple[_DispatchItem, ...]] = attrs.field(init=False, factory=dict)
 
     @staticmethod
     def load(hass: core.HomeAssistant) -> "StateChangedManager":
         _LOGGER.debug("Load %s", StateChangedManager)
-        instance = StateChangedManager(hass)
-        instance.cancel_callback = hass.bus.async_listen(
-            event_type=const.EVENT_STATE_CHANGED,
-            listener=instance._event_listener,
-            run_immediately=True,
-        )
-        return instance
+        return StateChangedManager(hass)
 
     def unload(self):
         _LOGGER.debug("Unload %s", self)
-        assert self.cancel_callback, "Cancel callback for listener not set"
-        self.cancel_callback()
+        for cancel_callback in self.entity_cancel_callbacks.values():
+            cancel_callback()
+        self.entity_cancel_callbacks.clear()
 
     @core.callback
     def _event_listener(self, event: core.Event) -> None:
-        entity_id = event.data['entity_id']
-        _LOGGER.debug("Change state event for %s", entity_id)
-        old = typing.cast(core.State, event.data['old_state'])
-        new = typing.cast(core.State, event.data['new_state'])
+        event_data = event.data
+        entity_id = event_data['entity_id']
+        is_debug = _LOGGER.isEnabledFor(DEBUG)
+        if is_debug:
+            _LOGGER.debug("Change state event for %s", entity_id)
+        dispatch = self._entity_dispatch.get(entity_id)
+        if dispatch is None:
+            entity_state_triggers = self.entity_state_triggers.get(entity_id)
+            if not entity_state_triggers:
+                return
+            dispatch = self._entity_dispatch[entity_id] = self._build_dispatch(entity_state_triggers)
+        condition_kwargs = {
+            'entity_id': entity_id,
+            'old': typing.cast(core.State, event_data['old_state']),
+            'new': typing.cast(core.State, event_data['new_state']),
+        }
 
+        # plan is not shared between events: action can fire state change and run listener again
         action_plan = {}
-        entity_state_triggers = self.entity_state_triggers.get(entity_id, [])
-        for state_event, script, action in entity_state_triggers:
-            if self._test_state_event(state_event, entity_id, old, new):
-                action_plan.setdefault(script, []).append((state_event, action))
-        _LOGGER.debug("Found %s script", len(action_plan))
+        # results of conditions without arguments are the same for all triggers of event
+        condition_cache = {}
+        for condition_test, state_event, script, action in dispatch:
+            if condition_test is None or condition_test(condition_cache, **condition_kwargs):
+                script_actions = action_plan.get(script)
+                if script_actions is None:
+                    action_plan[script] = [(state_event, action)]
+                else:
+                    script_actions.append((state_event, action))
+        if is_debug:
+            _LOGGER.debug("Found %s script", len(action_plan))
+        is_trace = _LOGGER_TRACE.isEnabledFor(INFO)
         for script, action_list in action_plan.items():
-            _LOGGER.debug("Run actions on %s", script)
-            script.cancel_all_tasks()
-            for (state_event, action) in action_list:
-                _LOGGER.info("TRACE: =====================")
-                _LOGGER.info("TRACE: FOUND %s", state_event)
-                _LOGGER.info("TRACE: ON %s", script)
-                _LOGGER.info("TRACE: PERFORM %s", action)
-                script.run_action(action)
-        _LOGGER.debug("Finish processing of state event")
+            if is_debug:
+                _LOGGER.debug("Run actions on %s", script)
+            if is_trace:
+                for state_event, action in action_list:
+                    _LOGGER_TRACE.info("TRACE: =====================")
+                    _LOGGER_TRACE.info("TRACE: FOUND %s", state_event)
+                    _LOGGER_TRACE.info("TRACE: ON %s", script)
+                    _LOGGER_TRACE.info("TRACE: PERFORM %s", action)
+            script.replace_actions(action for _, action in action_list)
+        if is_debug:
+            _LOGGER.debug("Finish processing of state event")
 
     @staticmethod
-    def _test_state_event(state_event: StateEvent, entity_id: str, old: core.State, new: core.State) -> bool:
-        if state_event.condition is None:
-            return True
-        if state_event.condition(entity_id=entity_id, old=old, new=new):
-            return True
-        return False
+    def _build_dispatch(entity_state_triggers: list[tuple[StateEvent, Script, Action]]) -> tuple[_DispatchItem, ...]:
+        return tuple(
+            (None if state_event.condition is None else state_event.condition.cached_call, state_event, script, action)
+            for state_event, script, action in entity_state_triggers
+        )
 
     def add(self, state_event: StateEvent, script: Script, action: Action):
-        _LOGGER.debug("Register %s with %s and %s", state_event, script, action)
+        if _LOGGER.isEnabledFor(DEBUG):
+            _LOGGER.debug("Register %s with %s and %s", state_event, script, action)
         assert state_event.entity_id, "Empty entity ID in entity state trigger"
-        entity_triggers = self.entity_state_triggers.setdefault(state_event.entity_id, [])
+        entity_id = state_event.entity_id
+        entity_triggers = self.entity_state_triggers.get(entity_id)
+        if entity_triggers is None:
+            entity_triggers = self.entity_state_triggers[entity_id] = []
+            self.entity_cancel_callbacks[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._event_listener,
+            )
         entity_triggers.append((state_event, script, action))
+        self._entity_dispatch.pop(entity_id, None)
@@ -1,5 +1,6 @@
+import collections
 import typing
-from logging import getLogger
+from logging import DEBUG, getLogger
 
 import attrs
 
@@ -10,10 +11,11 @@ from .state_event import StateEvent
 _LOGGER = getLogger(__name__)
 
 
-@attrs.frozen
+@attrs.frozen(slots=True, cache_hash=True)
 class State:
     name: str
     condition: Condition
+    # side effects and events are stored as tuples, single item or list is accepted
     side_effect: list[Action] | Action | None = attrs.field(hash=False, default=None)
     activated_by: list[StateEvent] | StateEvent | None = attrs.field(hash=False, default=None)
     affect_by: list[StateEvent] | StateEvent | None = attrs.field(hash=False, default=None)
@@ -21,141 +23,222 @@ class State:
 
     def __attrs_post_init__(self):
         global _state_manager
+        # single items and lists are normalized to tuples once, so rest of code iterates them directly
+        object.__setattr__(self, "side_effect", _to_tuple(self.side_effect))
+        object.__setattr__(self, "activated_by", _to_tuple(self.activated_by))
+        object.__setattr__(self, "affect_by", _to_tuple(self.affect_by))
+        depend_on = self.depend_on
+        if depend_on and isinstance(depend_on[0], State):
+            depend_on = (depend_on,)
+        object.__setattr__(self, "depend_on", tuple(depend_on) if depend_on else ())
         _state_manager.add(self)
 
     def __str__(self):
         return "#" + self.name + "#"
 
     def __invert__(self) -> "State":
-        if self.side_effect is not None:
+        if self.side_effect:
             raise ValueError("Only states without side_effects can be inverted")
         return attrs.evolve(self, name="NOT " + self.name, condition=~self.condition)
 
 
-@attrs.define
+@attrs.define(slots=True, weakref_slot=False)
 class StateManager:
-    states: set[State] = attrs.field(factory=set)
-    state_events: dict[State, list[StateEvent]] = attrs.field(factory=dict)
-    state_activate_events: dict[State, list[StateEvent]] = attrs.field(factory=dict)
-    state_bases: dict[State, list[list[list[State], Condition | None]]] = attrs.field(factory=dict)
+    # registered states in order of creation (dict is used as ordered set)
+    states: dict[State, None] = attrs.field(factory=dict)
+    state_events: collections.defaultdict[State, list[StateEvent]] = attrs.field(
+        factory=lambda: collections.defaultdict(list))
+    state_activate_events: collections.defaultdict[State, list[StateEvent]] = attrs.field(
+        factory=lambda: collections.defaultdict(list))
+    state_bases: collections.defaultdict[State, list[list[list[State], Condition | None]]] = attrs.field(
+        factory=lambda: collections.defaultdict(list))
+    # incremented on every added state to detect that built events are outdated
+    generation: int = 0
+    # generation and events of states built for it (shared between builders, must not be modified)
+    built_state_to_events: tuple[int, dict[State, list[StateEvent]]] | None = attrs.field(default=None, repr=False)
+    # added states that are not registered yet (cached hash of state is not available during its init)
+    new_states: list[State] = attrs.field(factory=list, repr=False)
 
     def add(self, state: State):
         _LOGGER.debug("Add %s", state)
-        self.states.add(state)
-        if state.activated_by is not None:
+        self.generation += 1
+        self.new_states.append(state)
+
+    def register_new_states(self):
+        for state in self.new_states:
+            self._register(state)
+        self.new_states.clear()
+
+    def _register(self, state: State):
+        self.states[state] = None
+        if state.activated_by:
             _LOGGER.debug("Add %s that can be activated by events", state)
-            event_list = state.activated_by if isinstance(state.activated_by, list) else [state.activated_by]
-            self.state_activate_events.setdefault(state, []).extend(event_list)
-        if state.affect_by is not None:
+            self.state_activate_events[state].extend(state.activated_by)
+        if state.affect_by:
             _LOGGER.debug("Add %s that affected by event", state)
-            event_list = state.affect_by if isinstance(state.affect_by, list) else [state.affect_by]
-            self.state_events.setdefault(state, []).extend(event_list)
-        if state.depend_on is not None:
+            self.state_events[state].extend(state.affect_by)
+        if state.depend_on:
             _LOGGER.debug("Add %s that depends on other states", state)
-            depend_list = state.depend_on if isinstance(state.depend_on, list) else [state.depend_on]
-            self.state_bases.setdefault(state, []).extend([list(i), None] for i in depend_list)
+            self.state_bases[state].extend([list(i), None] for i in state.depend_on)
 
 
 _state_manager = StateManager()
 
 
-@attrs.define
+def _to_tuple(value) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value,
+
+
+def _and_conditions(left: Condition | None, right: Condition | None) -> Condition | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left & right
+
+
+@attrs.define(slots=True, weakref_slot=False)
 class ScriptBuilder:
-    state_to_events: dict[State, list[StateEvent]] = attrs.field(factory=dict)
+    state_to_events: collections.defaultdict[State, list[StateEvent]] = attrs.field(
+        factory=lambda: collections.defaultdict(list))
 
     def build_state_to_event(self):
-        self.state_to_events = {}
-        all_states = set(_state_manager.states)
-        count = 100
-        while all_states and count > 0:
-            for state in all_states:
-                _LOGGER.debug("Try %s", state)
-                if self._try_activate_events(state) or self._try_events(state) or self._try_bases(state):
-                    all_states.remove(state)
-                    break
+        """
+        Build events of all states or reuse events built for the same registered states
+        """
+        _state_manager.register_new_states()
+        built = _state_manager.built_state_to_events
+        if built is not None and built[0] == _state_manager.generation:
+            _LOGGER.debug("States are not changed. Use built events")
+            self.state_to_events = built[1]
+            return self.state_to_events
+        generation = _state_manager.generation
+        self._build_state_to_event()
+        _state_manager.built_state_to_events = (generation, self.state_to_events)
         return self.state_to_events
 
-    def _try_activate_events(self, state: State) -> bool:
-        activate_events = _state_manager.state_activate_events.get(state)
-        if activate_events is None:
-            return False
-        assert state not in _state_manager.state_events, f"{state} both in activated event and state event"
+    def _build_state_to_event(self):
+        """
+        Build events of all states processing each state after all states it depends on (topological order)
+        """
+        self.state_to_events = collections.defaultdict(list)
+        state_activate_events = _state_manager.state_activate_events
+        state_events = _state_manager.state_events
+        state_bases = _state_manager.state_bases
+        # how to get events of state: activate events, state events or bases (in order of priority)
+        plans: dict[State, tuple[typing.Callable[[State, list], None], list] | None] = {}
+        dependents: collections.defaultdict[State, list[State]] = collections.defaultdict(list)
+        in_degree: dict[State, int] = {}
+        # ready states are processed in order of registration
+        ready: collections.deque[State] = collections.deque()
+        for state in _state_manager.states:
+            base_states = ()
+            activate_events = state_activate_events.get(state)
+            events = state_events.get(state)
+            bases = state_bases.get(state)
+            if activate_events is not None:
+                assert events is None, f"{state} both in activated event and state event"
+                plans[state] = (self._apply_activate_events, activate_events)
+            elif events is not None:
+                plans[state] = (self._apply_events, events)
+            elif bases is not None:
+                plans[state] = (self._apply_bases, bases)
+                base_states = {i for base_list, _ in bases for i in base_list}
+            else:
+                plans[state] = None
+            in_degree[state] = len(base_states)
+            for base_state in base_states:
+                dependents[base_state].append(state)
+            if not base_states:
+                ready.append(state)
+        processed_count = 0
+        while ready:
+            state = ready.popleft()
+            processed_count += 1
+            _LOGGER.debug("Process %s", state)
+            plan = plans[state]
+            if plan is None:
+                _LOGGER.debug("%s is not activated by any event", state)
+            else:
+                apply, apply_data = plan
+                apply(state, apply_data)
+            for dependent in dependents.get(state, ()):
+                in_degree[dependent] -= 1
+                if not in_degree[dependent]:
+                    ready.append(dependent)
+        if processed_count != len(in_degree):
+            blocked_states = sorted(str(i) for i, degree in in_degree.items() if degree)
+            raise ValueError(f"Cyclic dependencies of states: {', '.join(blocked_states)}")
+
+    def _apply_activate_events(self, state: State, activate_events: list[StateEvent]):
         for event in activate_events:
             _LOGGER.debug("%s is activated by %s", state, event)
             _LOGGER.debug("ADD %s >> %s", state, event)
-            self.state_to_events.setdefault(state, []).append(event)
-        return True
+            self.state_to_events[state].append(event)
 
-    def _try_events(self, state: State) -> bool:
-        state_events = _state_manager.state_events.get(state)
-        if state_events is None:
-            return False
+    def _apply_events(self, state: State, state_events: list[StateEvent]):
         for event in state_events:
             _LOGGER.debug("%s can be activated by %s", state, event)
-            _LOGGER.debug("ADD %s >> %s", state, event >> state.condition)
-            self.state_to_events.setdefault(state, []).append(event >> state.condition)
-        return True
+            final_event = event >> state.condition
+            _LOGGER.debug("ADD %s >> %s", state, final_event)
+            self.state_to_events[state].append(final_event)
 
-    def _try_bases(self, state: State) -> bool:
-        bases = _state_manager.state_bases.get(state)
-        if bases is None:
-            return False
+    def _apply_bases(self, state: State, bases: list[list[list[State], Condition | None]]):
         _LOGGER.debug("Found bases for %s", state)
-        for idx, (base_states, base_condition) in enumerate(bases):
-            _LOGGER.debug("Bases states: %s", ", ".join(str(i) for i in base_states))
-            if self._try_base_states(state, base_states, base_condition):
-                del bases[idx]
-                break
-        if bases:
-            return False
+        is_debug = _LOGGER.isEnabledFor(DEBUG)
+        for base_states, base_condition in bases:
+            if is_debug:
+                _LOGGER.debug("Bases states: %s", ", ".join(str(i) for i in base_states))
+            if not self._try_base_states(state, base_states, base_condition):
+                raise ValueError(f"Some of base states of {state} are not activated by any event")
         _LOGGER.debug("All bases for %s processed", state)
-        return True
 
     def _try_base_states(self, main_state: State, base_states: list[State], base_condition: Condition = None) -> bool:
-        _LOGGER.debug("Process base states: %s", ", ".join(str(i) for i in base_states))
+        is_debug = _LOGGER.isEnabledFor(DEBUG)
+        if is_debug:
+            _LOGGER.debug("Process base states: %s", ", ".join(str(i) for i in base_states))
         events = [self.state_to_events.get(i) for i in base_states]
         if any(i is None for i in events):
             _LOGGER.debug("Can not found events for all bases")
             return False
+        # condition of all base states except idx is prefix[idx] & suffix[idx + 1]
+        prefix = [base_condition]
+        for state in base_states:
+            prefix.append(_and_conditions(prefix[-1], state.condition))
+        suffix = [None]
+        for state in reversed(base_states):
+            suffix.append(_and_conditions(state.condition, suffix[-1]))
+        suffix.reverse()
         for idx, event_list in enumerate(events):
-            _LOGGER.debug("%s event list:\n %s", idx, "\n".join(str(i) for i in event_list))
-            other_states = list(base_states)
-            del other_states[idx]
-            _LOGGER.debug("Other states: %s", ", ".join(str(i) for i in other_states))
-            if other_states:
-                _LOGGER.debug("Process other states, start with base condition %s", base_condition)
-                event_condition = base_condition
-                for state in other_states:
-                    if event_condition is None:
-                        event_condition = state.condition
-                    elif state.condition is not None:
-                        event_condition = event_condition & state.condition
-            else:
-                _LOGGER.debug("No other states. Use base condition %s", base_condition)
-                event_condition = base_condition
+            if is_debug:
+                _LOGGER.debug("%s event list:\n %s", idx, "\n".join(str(i) for i in event_list))
+            event_condition = _and_conditions(prefix[idx], suffix[idx + 1])
             _LOGGER.debug("Event condition: %s", event_condition)
             for event in event_list:
                 _LOGGER.debug("For %s add %s with condition %s", main_state, event, event_condition)
                 final_event = event if event_condition is None else (event >> event_condition)
                 _LOGGER.debug("ADD %s >> %s", main_state, final_event)
-                self.state_to_events.setdefault(main_state, []).append(final_event)
+                self.state_to_events[main_state].append(final_event)
         return True
 
     def build_event_script(self, filter_events: set[State] = None):
         self.build_state_to_event()
         filter_events = filter_events if filter_events is not None else _state_manager.states
-        result = {}
+        result = collections.defaultdict(list)
         for state, event_list in self.state_to_events.items():
             if state not in filter_events:
                 _LOGGER.debug("%s is filtered out")
                 continue
-            if state.side_effect is None:
+            if not state.side_effect:
                 _LOGGER.debug("%s does not have side effects")
                 continue
-            side_effects = state.side_effect if isinstance(state.side_effect, list) else [state.side_effect]
             for event in event_list:
-                result.setdefault(event, []).extend(side_effects)
-        return result
+                result[event].extend(state.side_effect)
+        return dict(result)
 
 
 def build_script(filter_events: typing.Iterable[State] = None) -> dict[StateEvent, Action]:
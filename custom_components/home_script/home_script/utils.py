@@ -1,5 +1,6 @@
 import inspect
 import typing
+import weakref
 from logging import getLogger
 
 _LOGGER = getLogger(__name__)
@@ -10,10 +11,33 @@ __all__ = (
 )
 
 
+# results of inspection by callable and skip_kwargs (weak keys: functions of unloaded scripts are not kept)
+_PARAMS_CACHE: weakref.WeakKeyDictionary[typing.Callable, dict[bool, tuple[bool, tuple[str]]]] = \
+    weakref.WeakKeyDictionary()
+
+_SKIP_PARAMS = frozenset(("args", "kwargs"))
+
+
 def function_or_method_and_params(func_or_method: typing.Callable, skip_kwargs: bool = True) -> tuple[bool, tuple[str]]:
-    signature = inspect.signature(func_or_method)
-    skip_set = ("args", "kwargs") if skip_kwargs else ()
-    params = tuple(i for i in signature.parameters if i not in skip_set)
+    try:
+        cached = _PARAMS_CACHE.get(func_or_method)
+    except TypeError:
+        # callable can not be weak referenced or hashed
+        return _function_or_method_and_params(func_or_method, skip_kwargs)
+    if cached is None:
+        cached = _PARAMS_CACHE[func_or_method] = {}
+    result = cached.get(skip_kwargs)
+    if result is None:
+        result = cached[skip_kwargs] = _function_or_method_and_params(func_or_method, skip_kwargs)
+    return result
+
+
+def _function_or_method_and_params(func_or_method: typing.Callable, skip_kwargs: bool) -> tuple[bool, tuple[str]]:
+    parameters = inspect.signature(func_or_method).parameters
+    if skip_kwargs:
+        params = tuple(i for i in parameters if i not in _SKIP_PARAMS)
+    else:
+        params = tuple(parameters)
     is_method = bool(params) and "self" == params[0]
     if is_method:
         params = params[1:]
@@ -21,26 +45,37 @@ def function_or_method_and_params(func_or_method: typing.Callable, skip_kwargs:
 
 
 def is_async(func) -> bool:
-    if inspect.iscoroutinefunction(func):
-        return True
-    real_func = getattr(func, "__func__", None)
-    if real_func is not None and inspect.iscoroutinefunction(real_func):
-        return True
-    return False
+    # inspect unwraps bound methods and partials itself, but not raw static or class method objects
+    return inspect.iscoroutinefunction(getattr(func, "__func__", func))
 
 
 def format_schema(value, ind=0) -> str:
     """
     Output event/condition schema in beautiful (at least readable way)
     """
-    ind_s = " " * ind
-    ind_ss = " " * (ind + 2)
+    out = []
+    _format_schema(value, ind, out)
+    return "".join(out)
+
+
+def _format_schema(value, ind: int, out: list[str]):
     if isinstance(value, dict):
-        lines = (f"{ind_ss}{k}: {format_schema(v, ind + 2)}" for k, v in value.items())
-        internal = ", \n".join(lines)
-        return "{\n" + internal + "\n" + ind_s + "}"
-    if isinstance(value, list):
-        lines = (f"{ind_ss}{format_schema(i, ind + 2)}" for i in value)
-        internal = ", \n".join(lines)
-        return "[\n" + internal + "\n" + ind_s + "]"
-    return str(value)
+        out.append("{\n")
+        ind_ss = " " * (ind + 2)
+        for idx, (k, v) in enumerate(value.items()):
+            if idx:
+                out.append(", \n")
+            out += (ind_ss, str(k), ": ")
+            _format_schema(v, ind + 2, out)
+        out += ("\n", " " * ind, "}")
+    elif isinstance(value, list):
+        out.append("[\n")
+        ind_ss = " " * (ind + 2)
+        for idx, item in enumerate(value):
+            if idx:
+                out.append(", \n")
+            out.append(ind_ss)
+            _format_schema(item, ind + 2, out)
+        out += ("\n", " " * ind, "]")
+    else:
+        out.append(str(value))
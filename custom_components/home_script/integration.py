@@ -1,5 +1,5 @@
 import asyncio
-import inspect
+import os
 import pathlib
 import typing
 from logging import getLogger
@@ -10,6 +10,7 @@ from homeassistant import core
 from homeassistant.const import (EVENT_CORE_CONFIG_UPDATE,
                                  EVENT_HOMEASSISTANT_STARTED,
                                  EVENT_HOMEASSISTANT_STOP)
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util.event_type import EventType
 from . import const, entity
 from .script_repository import ScriptRepository
@@ -22,13 +23,18 @@ LOAD_DELAY_S = 5
 # delay to load script on start up
 LOAD_START_DELAY_S = 5
 
+# main module is a package placed near integration
+MAIN_MODULE_PATH = pathlib.Path(
+    os.path.realpath(os.path.join(os.path.dirname(__file__), "home_script", "__init__.py"))
+)
+
 
 def _script_dir(hass: core.HomeAssistant) -> pathlib.Path:
     assert hass.config.config_dir, "Unknown config director"
     return (pathlib.Path(hass.config.config_dir) / "home_script").resolve()
 
 
-@attrs.define
+@attrs.define(slots=True, weakref_slot=False)
 class HomeScriptIntegration:
     """
     Home script integration instance has all scripts together.
@@ -49,6 +55,7 @@ class HomeScriptIntegration:
 
     _listeners: list[core.CALLBACK_TYPE] = attrs.field(factory=list)
     _load_task: asyncio.Task | None = None
+    _cancel_load_timer: core.CALLBACK_TYPE | None = None
     _script_entities: dict[str, entity.ModuleEntity] = attrs.field(factory=dict)
 
     @staticmethod
@@ -94,6 +101,7 @@ class HomeScriptIntegration:
     def _hass_stopped_listener(self, _event: core.Event):
         _LOGGER.debug("HASS stopped.")
         self.watch_dog.stop()
+        self._cancel_planned_load()
         if self._load_task:
             self._load_task.cancel()
         if self.script_repository:
@@ -113,30 +121,51 @@ class HomeScriptIntegration:
     def _plan_load_task(self, load_delay: int = LOAD_DELAY_S, force: bool = False):
         # _LOGGER.debug("Plan load in %s (force %s)", load_delay, force)
 
+        self._cancel_planned_load()
         if self._load_task:
             # _LOGGER.debug("Cancel previous load request")
             self._load_task.cancel()
+            self._load_task = None
 
         async def load_task():
             # noinspection PyBroadException
             try:
-                # _LOGGER.debug("Delay load of home script %s", load_delay)
-                await asyncio.sleep(load_delay)
-                self.load_and_start(force)
+                await self.async_load_and_start(force)
             except asyncio.CancelledError:
                 pass
             except Exception:
                 self._update_status(const.STATUS_ERROR)
                 # _LOGGER.exception("Can not load home script")
-            self._load_task = None
+            if self._load_task is asyncio.current_task():
+                self._load_task = None
 
-        self._update_status(const.STATUS_WAITING)
-        self._load_task = self.hass.async_create_task(load_task())
+        @core.callback
+        def start_load(_now):
+            self._cancel_load_timer = None
+            self._load_task = self.hass.async_create_task(load_task())
 
-    def load_and_start(self, force: bool = False):
-        module_path = pathlib.Path(inspect.getfile(HomeScriptIntegration)) / ".." / "home_script" / "__init__.py"
-        module_path = module_path.resolve()
-        new_script_repository = ScriptRepository(module_path, self.script_dir)
+        self._update_status(const.STATUS_WAITING)
+        # delay is a timer of event loop, task is created only for loading itself
+        self._cancel_load_timer = async_call_later(self.hass, load_delay, start_load)
+
+    def _cancel_planned_load(self):
+        if self._cancel_load_timer:
+            self._cancel_load_timer()
+            self._cancel_load_timer = None
+
+    async def async_load_and_start(self, force: bool = False):
+        # finding and hashing of script files is blocking I/O, so it is done in executor
+        new_script_repository = await self.hass.async_add_executor_job(self._create_script_repository)
+        self._start_script_repository(new_script_repository, force)
+
+    def _create_script_repository(self) -> ScriptRepository:
+        previous_files = self.script_repository.files if self.script_repository else {}
+        return ScriptRepository(MAIN_MODULE_PATH, self.script_dir, previous_files)
+
+    def _start_script_repository(self, new_script_repository: ScriptRepository, force: bool):
+        """
+        Replace current scripts by new ones (scripts are executed in event loop: they use HASS API)
+        """
         if not force and not new_script_repository.is_different_from(self.script_repository):
             _LOGGER.debug("Script repository is not changed. Skip loading")
             self._update_status(const.STATUS_RUN)
@@ -172,6 +201,7 @@ class HomeScriptIntegration:
 
     def _update_all_script_status(self):
         unknown_scripts = set(self._script_entities)
+        changed_entities = []
         if self.script_repository:
             for item in self.script_repository.scripts:
                 # STATUS_LOADING, const.STATUS_ERROR, , const.STATUS_STOPPED
@@ -181,20 +211,30 @@ class HomeScriptIntegration:
                     status = const.STATUS_ERROR
                 else:
                     status = const.STATUS_LOADING
-                self._set_script_entity_status(item.name, status)
+                self._defer_script_entity_status(item.name, status, changed_entities)
                 unknown_scripts.discard(item.name)
         for unknown_name in unknown_scripts:
             _LOGGER.debug("Found unknown script %s", unknown_name)
-            self._set_script_entity_status(unknown_name, const.STATUS_ERROR)
+            self._defer_script_entity_status(unknown_name, const.STATUS_ERROR, changed_entities)
+        self._write_script_entities(changed_entities)
 
-    def _set_script_entity_status(self, name: str, status: str) -> None:
+    def _defer_script_entity_status(self, name: str, status: str, changed_entities: list[entity.ModuleEntity]) -> None:
         # noinspection PyBroadException
         try:
             script_entity = self._script_entities.get(name)
             if script_entity is None:
                 script_entity = self._script_entities[name] = entity.ModuleEntity(self.hass, name)
-            if script_entity.state != status:
+            if script_entity.defer_status(status):
                 _LOGGER.debug("Set status of script %s to %s", name, status)
-                script_entity.set_status(status)
+                changed_entities.append(script_entity)
         except Exception:
             _LOGGER.exception("Can not set script %s status %s", name, status)
+
+    @staticmethod
+    def _write_script_entities(changed_entities: list[entity.ModuleEntity]) -> None:
+        for script_entity in changed_entities:
+            # noinspection PyBroadException
+            try:
+                script_entity.async_write_ha_state()
+            except Exception:
+                _LOGGER.exception("Can not write state of %s", script_entity.entity_id)
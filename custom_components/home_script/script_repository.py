@@ -3,8 +3,8 @@ from __future__ import annotations
 import hashlib
 import importlib
 import importlib.util
-import inspect
 import logging
+import os
 import pathlib
 import sys
 import typing
@@ -16,17 +16,31 @@ _LOGGER = logging.getLogger(__name__)
 MAIN_MODULE = "home_script"
 SCRIPT_MODULE = "home_script.custom."
 
-FILE_PATTERS = ("*.py", "*.PY", "*.pY", "*.Py", )
 
+def sha256sum(file_path: str | os.PathLike) -> bytes:
+    # file is hashed by chunks and closed right after it
+    # file_digest reads to its own buffer, so python buffering would only copy data twice
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").digest()
 
-def sha256sum(file_path: pathlib.Path) -> bytes:
-    h = hashlib.sha256()
-    h.update(file_path.open("rb").read())
-    return h.digest()
 
+def _is_script(file_name: str) -> bool:
+    name = file_name.lower()
+    # `.py` itself is hidden file without suffix
+    return name.endswith(".py") and name != ".py"
 
-def _is_script(file_path: pathlib.Path) -> bool:
-    return file_path.suffix.lower() == ".py"
+
+def _walk_scripts(dir_path: str) -> typing.Iterator[os.DirEntry]:
+    """
+    Find python files recursively using type of entries cached by scandir
+    """
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            # links to directories are not followed to avoid loops
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_scripts(entry.path)
+            elif _is_script(entry.name) and entry.is_file():
+                yield entry
 
 
 @attrs.define
@@ -40,6 +54,19 @@ class FileDetails:
     is_loaded: bool = False
     is_stopped: bool = False
     load_error: BaseException | None = None
+    # size and modification time of file to detect that file is not modified since previous search
+    file_stat: tuple[int, int] | None = None
+    # path found during search to avoid joining of script dir and path again
+    full_path: str | None = attrs.field(default=None, repr=False)
+    # computed once from path (name of module is only for script)
+    is_script: bool = attrs.field(init=False, eq=False, repr=False)
+    name: str | None = attrs.field(init=False, eq=False, repr=False)
+    full_name: str | None = attrs.field(init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.is_script = (self.script_dir / self.path).parent == self.script_dir
+        self.name = self.path.with_suffix("").name if self.is_script else None
+        self.full_name = SCRIPT_MODULE + self.name if self.is_script else None
 
     def __str__(self):
         if not self.is_script:
@@ -53,25 +80,14 @@ class FileDetails:
             return f"failed {name} ({self.load_error})"
         return name
 
-    @property
-    def is_script(self):
-        return (self.script_dir / self.path).parent == self.script_dir
-
-    @property
-    def name(self) -> str:
-        assert self.is_script, "Only script has name"
-        return self.path.with_suffix("").name
-
-    @property
-    def full_name(self) -> str:
-        return SCRIPT_MODULE + self.name
-
     def load(self):
         _LOGGER.debug("Load %s", self)
         try:
+            assert self.is_script, "Only script can be loaded"
             assert self.name != "home_script", "Module name can not be 'home_script'"
             assert self.full_name not in sys.modules, f"Module {self.full_name} is loaded"
-            spec = importlib.util.spec_from_file_location(self.full_name, self.script_dir / self.path)
+            location = self.full_path if self.full_path is not None else self.script_dir / self.path
+            spec = importlib.util.spec_from_file_location(self.full_name, location)
             module = importlib.util.module_from_spec(spec)
             sys.modules[self.full_name] = module
             spec.loader.exec_module(module)
@@ -92,34 +108,54 @@ class ScriptRepository:
 
     :ivar script_dir_path: path to directory with script
     :ivar files: all found files
+    :ivar previous_files: files of previous repository to reuse hashes of not modified files (only during search)
+    :ivar tree_digest: hash of paths and hashes of all files to compare repositories
     """
     module_path: pathlib.Path
     script_dir_path: pathlib.Path
+    previous_files: dict[pathlib.Path, FileDetails] = attrs.field(factory=dict, repr=False)
     files: dict[pathlib.Path, FileDetails] = attrs.field(init=False, factory=dict)
     main_module: typing.Any = None
+    tree_digest: bytes = attrs.field(init=False, default=b"", repr=False)
+    # files are not changed after search, so scripts are collected once
+    _scripts: tuple[FileDetails, ...] = attrs.field(init=False, default=(), repr=False)
+    _scripts_by_full_name: dict[str, FileDetails] = attrs.field(init=False, factory=dict, repr=False)
 
     def __attrs_post_init__(self):
         if not self.script_dir_path.exists():
             self._fallback_in_case_of_no_path()
         else:
             self._load_files()
+        self.previous_files = {}
+        self.tree_digest = self._build_tree_digest()
+        self._scripts = tuple(i for i in self.files.values() if i.is_script)
+        # first script is found by name in case of duplication
+        self._scripts_by_full_name = {i.full_name: i for i in reversed(self._scripts)}
 
     def __str__(self):
         return f"scripts in {self.script_dir_path}"
 
     @property
     def scripts(self) -> tuple[FileDetails, ...]:
-        return tuple(i for i in self.files.values() if i.is_script)
+        return self._scripts
 
     @property
     def file_hashes(self) -> dict[pathlib.Path, bytes]:
         return {k: v.hash_sum for k, v in self.files.items()}
 
     def is_different_from(self, other: ScriptRepository | None) -> bool:
-        return other is None or self.file_hashes != other.file_hashes
+        return other is None or self.tree_digest != other.tree_digest
+
+    def _build_tree_digest(self) -> bytes:
+        h = hashlib.sha256()
+        for file_path in sorted(self.files):
+            h.update(bytes(file_path))
+            h.update(b"\0")
+            h.update(self.files[file_path].hash_sum)
+        return h.digest()
 
     def get_script(self, full_name: str) -> FileDetails | None:
-        return next((i for i in self.scripts if i.full_name == full_name), None)
+        return self._scripts_by_full_name.get(full_name)
 
     def load(self, hass) -> bool:
         try:
@@ -130,17 +166,20 @@ class ScriptRepository:
                 return True
             assert len({i.name for i in self.scripts}) == len(self.scripts), "Duplication of script names"
             self._load_main_module(hass)
-            old_paths = sys.path
-            sys.path.insert(0, str(self.script_dir_path.absolute()))
+            script_dir = str(self.script_dir_path.absolute())
+            # directory is kept in path if it is already there (e.g. added by user)
+            need_insert = script_dir not in sys.path
+            if need_insert:
+                sys.path.insert(0, script_dir)
             modules = []
             try:
                 for item in self.scripts:
                     modules.append(item.load())
                 modules = [i for i in modules if i]
             finally:
-                _LOGGER.debug("Restore paths")
-                del sys.path[0]
-                assert sys.path == old_paths, "Path is changed after loading"
+                if need_insert:
+                    _LOGGER.debug("Restore paths")
+                    sys.path.remove(script_dir)
             if modules:
                 self.main_module.load(modules)
         except Exception as ex:
@@ -171,34 +210,37 @@ class ScriptRepository:
         _LOGGER.info("Unload main module %s", self.main_module)
         if self.scripts:
             self.main_module.unload()
-        main_module_path = pathlib.Path(self.main_module.__file__).parent.absolute()
+        main_module_path = os.path.dirname(os.path.abspath(self.main_module.__file__))
         # self.main_module.unload()
         _LOGGER.debug("Remove main module %s (%s) from cache", self.main_module, main_module_path)
         del sys.modules[MAIN_MODULE]
 
         _LOGGER.debug("Remove submodules and dependent modules")
+        prefix = main_module_path + os.sep
         for key, module in list(sys.modules.items()):
-            if not inspect.ismodule(module) or getattr(module, "__file__", None) is None:
+            module_path = getattr(module, "__file__", None)
+            if not isinstance(module_path, str):
                 continue
-            module_path = pathlib.Path(inspect.getfile(module)).absolute()
-            if main_module_path not in module_path.parents:
+            if not os.path.isabs(module_path):
+                module_path = os.path.abspath(module_path)
+            if not module_path.startswith(prefix):
                 continue
             _LOGGER.debug("Remove submodule %s (%s)", module, module_path)
             del sys.modules[key]
 
     def _unload_scripts(self):
         _LOGGER.info("Unload scripts from %s", self.script_dir_path)
+        prefix = str(self.script_dir_path) + os.sep
         for key, module in list(sys.modules.items()):
-            if not inspect.ismodule(module) or getattr(module, "__file__", None) is None:
+            module_path = getattr(module, "__file__", None)
+            if not isinstance(module_path, str) or not module_path.startswith(prefix):
                 continue
-            module_path = pathlib.Path(inspect.getfile(module))
-            if self.script_dir_path in module_path.parents:
-                _LOGGER.debug("Unload %s: %s", key, module)
-                del sys.modules[key]
-                script = self.get_script(key)
-                if script:
-                    _LOGGER.debug("Unloaded %s", script)
-                    script.is_stopped = True
+            _LOGGER.debug("Unload %s: %s", key, module)
+            del sys.modules[key]
+            script = self.get_script(key)
+            if script:
+                _LOGGER.debug("Unloaded %s", script)
+                script.is_stopped = True
         remain_scripts = [str(i) for i in self.scripts if i.is_loaded and not i.is_stopped]
         assert not remain_scripts, f"Some script was not unloaded: {', '.join(sorted(remain_scripts))}"
         _LOGGER.debug("Everything is unloaded")
@@ -209,17 +251,32 @@ class ScriptRepository:
 
     def _load_files(self):
         _LOGGER.debug("Load files from %s", self.script_dir_path)
-        for file_glob in FILE_PATTERS:
-            for file_path in self.script_dir_path.rglob(file_glob):
-                self._process_file(file_path.relative_to(self.script_dir_path))
+        for entry in _walk_scripts(str(self.script_dir_path)):
+            self._process_file(entry)
+        self._hash_files()
         _LOGGER.debug("Finish load files")
 
-    def _process_file(self, file_path: pathlib.Path):
-        if not _is_script(file_path):
-            _LOGGER.debug("Skip %s because not script", file_path)
-            return
+    def _process_file(self, entry: os.DirEntry):
+        file_path = pathlib.Path(entry.path).relative_to(self.script_dir_path)
         if file_path in self.files:
             _LOGGER.debug("Skip processed %s", file_path)
             return
-        hash_sum = sha256sum(self.script_dir_path / file_path)
-        self.files[file_path] = FileDetails(self.script_dir_path, file_path, hash_sum)
+        stat = entry.stat()
+        file_stat = (stat.st_size, stat.st_mtime_ns)
+        previous = self.previous_files.get(file_path)
+        if previous is not None and previous.file_stat == file_stat:
+            _LOGGER.debug("Reuse hash of not modified %s", file_path)
+            hash_sum = previous.hash_sum
+        else:
+            # hash is computed later for all new and modified files together
+            hash_sum = b""
+        self.files[file_path] = FileDetails(
+            self.script_dir_path, file_path, hash_sum, file_stat=file_stat, full_path=entry.path,
+        )
+
+    def _hash_files(self):
+        # repository is created in executor of HASS, so files are hashed sequentially there
+        not_hashed = [i for i in self.files.values() if not i.hash_sum]
+        _LOGGER.debug("Hash %s files", len(not_hashed))
+        for item in not_hashed:
+            item.hash_sum = sha256sum(item.full_path)
@@ -1,19 +1,39 @@
+import asyncio
+import functools
+import os
+import threading
 import typing
 from logging import getLogger
 
 import attrs
 import watchdog
 import watchdog.observers
-from watchdog.events import FileSystemEvent, FileSystemEventHandler, FileSystemMovedEvent
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED, FileSystemEvent, FileSystemEventHandler,
+                             FileSystemMovedEvent)
 
 from homeassistant import core
 
 _LOGGER = getLogger(__name__)
 
+# delay to collect burst of file system events (e.g. git pull or save by editor) to one callback
+DEBOUNCE_S = 0.2
 
-def _is_skip(path):
-    path = str(path)
-    return path.endswith("~") or "/__pycache__" in path
+# backups, compiled files and swap files of editors
+_SKIP_SUFFIXES = ("~", ".pyc", ".swp", ".swx")
+_SKIP_DIR = "__pycache__"
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_skip_str(path: str) -> bool:
+    """
+    The same paths are checked many times during burst of events, so result is cached
+    """
+    if path.endswith(_SKIP_SUFFIXES):
+        return True
+    # cache directory itself or a file in it
+    head, tail = os.path.split(path)
+    return tail == _SKIP_DIR or os.path.basename(head) == _SKIP_DIR
 
 
 class WatchDogHandler(FileSystemEventHandler):
@@ -24,44 +44,74 @@ class WatchDogHandler(FileSystemEventHandler):
     """
     hass: core.HomeAssistant
     callback: typing.Callable[..., None] | None = None
+    _timer_handle: asyncio.TimerHandle | None = None
+    # planning is sent to event loop once until it is received
+    _is_sent: bool = False
+    _lock: threading.Lock
 
     def __init__(self, hass: core.HomeAssistant):
         self.hass = hass
+        self._lock = threading.Lock()
 
     def process(self, event: FileSystemEvent) -> None:
         """Send watchdog events to main loop task."""
         _LOGGER.debug("Watchdog found change in directory with scripts: %s", event)
+        if not self.callback:
+            return
+        with self._lock:
+            if self._is_sent:
+                return
+            self._is_sent = True
+        self.hass.loop.call_soon_threadsafe(self._plan_callback)
+
+    def _plan_callback(self) -> None:
+        """Run callback once after burst of events (executed in event loop)."""
+        with self._lock:
+            self._is_sent = False
+        if self._timer_handle is not None:
+            return
+        self._timer_handle = self.hass.loop.call_later(DEBOUNCE_S, self._run_callback)
+
+    def _run_callback(self) -> None:
+        self._timer_handle = None
         callback = self.callback
         if callback:
-            # noinspection PyTypeChecker
-            self.hass.add_job(self.callback)
+            callback()
+
+    def cancel_callback(self) -> None:
+        """Cancel planned callback (executed in event loop)."""
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+
+    def dispatch(self, event: FileSystemEvent) -> None:
+        """Skip not interesting events once before dispatching them by type."""
+        # modification of directory is a change of its listing that is reported by events of its files
+        if event.is_directory and event.event_type == EVENT_TYPE_MODIFIED:
+            return
+        # moving from skipped path to script (e.g. save by editor) is not skipped
+        if _is_skip_str(event.src_path) and (event.event_type != EVENT_TYPE_MOVED or _is_skip_str(event.dest_path)):
+            return
+        super().dispatch(event)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """File modified."""
-        if _is_skip(event.src_path) or event.is_directory:
-            return
         self.process(event)
 
     def on_moved(self, event: FileSystemMovedEvent) -> None:
         """File moved."""
-        if _is_skip(event.src_path) and _is_skip(event.dest_path):
-            return
         self.process(event)
 
     def on_created(self, event: FileSystemEvent) -> None:
         """File created."""
-        if _is_skip(event.src_path):
-            return
         self.process(event)
 
     def on_deleted(self, event: FileSystemEvent) -> None:
         """File deleted."""
-        if _is_skip(event.src_path):
-            return
         self.process(event)
 
 
-@attrs.define
+@attrs.define(slots=True, weakref_slot=False, eq=False)
 class ScriptWatchDog:
     handler: WatchDogHandler
     script_dir: str
@@ -77,12 +127,17 @@ class ScriptWatchDog:
         assert self.observer is None, "Restart without stop"
         self.handler.callback = callback
         self.observer = watchdog.observers.Observer()
+        # native observer of platform is selected by watchdog, polling is only a fallback
+        if isinstance(self.observer, PollingObserver):
+            _LOGGER.warning("Native file system events are not available. Poll %s for changes", self.script_dir)
         self.observer.schedule(self.handler, self.script_dir, recursive=True)
         self.observer.start()
 
     def stop(self):
         _LOGGER.debug("Stop watch dog")
         self.observer.stop()
-        self.observer.join()
+        # stop is called in event loop, so observer thread is joined in executor to not block it
+        self.handler.hass.async_add_executor_job(self.observer.join)
         self.handler.callback = None
+        self.handler.cancel_callback()
         self.observer = None
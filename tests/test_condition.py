@@ -0,0 +1,39 @@
+import types
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# noinspection PyPep8
+from custom_components.home_script.home_script.condition import condition, condition_decorator_factory
+
+state_condition = condition_decorator_factory({"entity_id", "old", "new"})
+
+
+# noinspection PyUnusedLocal
+@state_condition
+def new_not_none(entity_id, old, new) -> bool:
+    return new is not None
+
+
+# noinspection PyUnusedLocal
+@state_condition
+def new_on(entity_id, old, new) -> bool:
+    return new.state == "on"
+
+
+@condition
+def is_blocked() -> bool:
+    return False
+
+
+def test_guard_is_evaluated_first():
+    guarded = ~(~new_not_none | is_blocked) & new_on
+    assert guarded(entity_id="a.a", old=None, new=None) is False
+    assert guarded.cached_call({}, entity_id="a.a", old=None, new=None) is False
+    assert guarded(entity_id="a.a", old=None, new=types.SimpleNamespace(state="on")) is True
+
+
+def test_order_of_conditions_is_kept():
+    statement = new_not_none & new_on & is_blocked
+    assert statement.conditions == (new_not_none, new_on, is_blocked)